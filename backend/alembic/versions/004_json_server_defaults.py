@@ -0,0 +1,48 @@
+"""Move component tags and OIDC scopes defaults to the server
+
+Revision ID: 004_json_server_defaults
+Revises: 003_datasource_integration
+Create Date: 2024-12-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '004_json_server_defaults'
+down_revision: Union[str, None] = '003_datasource_integration'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Backfill before tightening the constraint
+    op.execute("UPDATE component SET tags = '{}'::jsonb WHERE tags IS NULL")
+    op.alter_column(
+        'component', 'tags',
+        existing_type=postgresql.JSONB,
+        server_default=sa.text("'{}'::jsonb"),
+        nullable=False,
+    )
+    op.alter_column(
+        'oidc_config', 'scopes',
+        existing_type=postgresql.ARRAY(sa.String),
+        server_default=sa.text("ARRAY['openid','profile','email']"),
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'oidc_config', 'scopes',
+        existing_type=postgresql.ARRAY(sa.String),
+        server_default=None,
+    )
+    op.alter_column(
+        'component', 'tags',
+        existing_type=postgresql.JSONB,
+        server_default=None,
+        nullable=True,
+    )
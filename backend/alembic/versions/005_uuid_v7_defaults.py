@@ -0,0 +1,69 @@
+"""Add uuid_generate_v7() and use it as the server default for primary keys
+
+Revision ID: 005_uuid_v7_defaults
+Revises: 004_json_server_defaults
+Create Date: 2024-12-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '005_uuid_v7_defaults'
+down_revision: Union[str, None] = '004_json_server_defaults'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Tables with a UUID "id" primary key
+TABLES = [
+    'component_group',
+    'component',
+    'incident',
+    'incident_update',
+    'maintenance_window',
+    'audit_log',
+    'local_user',
+    'oidc_config',
+    'datasource',
+    'external_incident',
+]
+
+
+def upgrade() -> None:
+    # Time-ordered UUIDs: 48-bit unix ms timestamp prefix over a random v4,
+    # with the version nibble flipped from 4 to 7
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+        BEGIN
+            RETURN encode(
+                set_bit(
+                    set_bit(
+                        overlay(
+                            uuid_send(gen_random_uuid())
+                            PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                            FROM 1 FOR 6
+                        ),
+                        52, 1
+                    ),
+                    53, 1
+                ),
+                'hex'
+            )::uuid;
+        END
+        $$ LANGUAGE plpgsql VOLATILE
+        """
+    )
+    
+    for table in TABLES:
+        op.alter_column(table, 'id', server_default=sa.text('uuid_generate_v7()'))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, 'id', server_default=None)
+    
+    op.execute('DROP FUNCTION IF EXISTS uuid_generate_v7()')
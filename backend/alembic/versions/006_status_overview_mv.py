@@ -0,0 +1,57 @@
+"""Add status overview materialized view
+
+Revision ID: 006_status_overview_mv
+Revises: 005_uuid_v7_defaults
+Create Date: 2024-12-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '006_status_overview_mv'
+down_revision: Union[str, None] = '005_uuid_v7_defaults'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Current status per component: worst active incident impact, then
+    # in-progress maintenance, otherwise operational
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW status_overview_mv AS
+        SELECT
+            c.id AS component_id,
+            CASE
+                WHEN EXISTS (
+                    SELECT 1 FROM incident_component ic
+                    JOIN incident i ON i.id = ic.incident_id
+                    WHERE ic.component_id = c.id
+                      AND i.status <> 'resolved'
+                      AND ic.impact = 'outage'
+                ) THEN 'major_outage'
+                WHEN EXISTS (
+                    SELECT 1 FROM incident_component ic
+                    JOIN incident i ON i.id = ic.incident_id
+                    WHERE ic.component_id = c.id
+                      AND i.status <> 'resolved'
+                ) THEN 'degraded'
+                WHEN EXISTS (
+                    SELECT 1 FROM maintenance_component mc
+                    JOIN maintenance_window mw ON mw.id = mc.maintenance_id
+                    WHERE mc.component_id = c.id
+                      AND mw.status = 'in_progress'
+                ) THEN 'maintenance'
+                ELSE 'operational'
+            END AS status
+        FROM component c
+        """
+    )
+    # Unique index is required for REFRESH ... CONCURRENTLY
+    op.execute("CREATE UNIQUE INDEX idx_status_overview_mv_component ON status_overview_mv (component_id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS status_overview_mv")
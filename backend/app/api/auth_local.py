@@ -11,11 +11,11 @@ from app.core.database import get_db
 from app.core.security import Role, CurrentUser, require_role
 from app.models.models import LocalUser
 from app.services.local_auth import (
-    authenticate_user,
+    authenticate_user_async,
     create_local_token,
-    create_local_user,
-    update_local_user_password,
-    hash_password,
+    create_local_user_async,
+    update_local_user_password_async,
+    verify_password_async,
 )
 from app.services.audit import log_action
 
@@ -89,7 +89,7 @@ async def login(
     
     This endpoint is for breakglass admin access when OIDC is unavailable.
     """
-    user = authenticate_user(db, data.username, data.password)
+    user = await authenticate_user_async(db, data.username, data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -142,8 +142,6 @@ async def change_own_password(
     This endpoint allows users to change their own password, especially
     after first login when must_change_password is set.
     """
-    from app.services.local_auth import verify_password
-    
     # Only works for local users
     if user.auth_type != "local":
         raise HTTPException(status_code=400, detail="Password change only available for local users")
@@ -153,15 +151,15 @@ async def change_own_password(
         raise HTTPException(status_code=404, detail="User not found")
     
     # Verify current password
-    if not verify_password(data.current_password, local_user.password_hash):
+    if not await verify_password_async(data.current_password, local_user.password_hash):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
     
     # Update password and clear must_change_password flag
-    update_local_user_password(db, local_user, data.new_password)
+    await update_local_user_password_async(db, local_user, data.new_password)
     local_user.must_change_password = False
-    db.commit()
-    
     log_action(db, user.user_id, "change_password", "local_user", str(local_user.id), None, None)
+    
+    db.commit()
 
 
 # ============================================================================
@@ -193,7 +191,7 @@ async def create_user(
     if existing:
         raise HTTPException(status_code=400, detail="Username already exists")
     
-    new_user = create_local_user(
+    new_user = await create_local_user_async(
         db=db,
         username=data.username,
         password=data.password,
@@ -237,11 +235,11 @@ async def update_user(
     for key, value in data.model_dump(exclude_unset=True).items():
         setattr(local_user, key, value)
     
+    log_action(db, user.user_id, "update", "local_user", str(user_id), before, data.model_dump(exclude_unset=True), skip_if_unchanged=True)
+    
     db.commit()
     db.refresh(local_user)
     
-    log_action(db, user.user_id, "update", "local_user", str(user_id), before, data.model_dump(exclude_unset=True))
-    
     return local_user
 
 
@@ -278,6 +276,6 @@ async def reset_user_password(
     if not local_user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    update_local_user_password(db, local_user, data.new_password)
+    await update_local_user_password_async(db, local_user, data.new_password)
     
     log_action(db, user.user_id, "reset_password", "local_user", str(user_id), None, None)
@@ -14,6 +14,7 @@ from app.schemas.schemas import (
     ComponentGroupCreate, ComponentGroupUpdate, ComponentGroupResponse,
 )
 from app.services.audit import log_action
+from app.services.cache import cache
 
 
 router = APIRouter(prefix="/components", tags=["Components"])
@@ -40,11 +41,13 @@ def create_group(
     """Create a new component group."""
     group = ComponentGroup(**data.model_dump())
     db.add(group)
+    db.flush()
+    log_action(db, user.user_id, "create", "component_group", str(group.id), None, data.model_dump())
+    
     db.commit()
+    cache.invalidate_status()
     db.refresh(group)
     
-    log_action(db, user.user_id, "create", "component_group", str(group.id), None, data.model_dump())
-    
     return group
 
 
@@ -65,11 +68,12 @@ def update_group(
     for key, value in data.model_dump(exclude_unset=True).items():
         setattr(group, key, value)
     
+    log_action(db, user.user_id, "update", "component_group", str(group.id), before, data.model_dump(exclude_unset=True), skip_if_unchanged=True)
+    
     db.commit()
+    cache.invalidate_status()
     db.refresh(group)
     
-    log_action(db, user.user_id, "update", "component_group", str(group.id), before, data.model_dump(exclude_unset=True))
-    
     return group
 
 
@@ -88,6 +92,7 @@ async def delete_group(
     
     db.delete(group)
     db.commit()
+    cache.invalidate_status()
 
 
 # ============================================================================
@@ -155,11 +160,13 @@ async def create_component(
     
     component = Component(**data.model_dump())
     db.add(component)
+    db.flush()
+    log_action(db, user.user_id, "create", "component", str(component.id), None, data.model_dump())
+    
     db.commit()
+    cache.invalidate_status()
     db.refresh(component)
     
-    log_action(db, user.user_id, "create", "component", str(component.id), None, data.model_dump())
-    
     return component
 
 
@@ -180,11 +187,12 @@ async def update_component(
     for key, value in data.model_dump(exclude_unset=True).items():
         setattr(component, key, value)
     
+    log_action(db, user.user_id, "update", "component", str(component.id), before, data.model_dump(exclude_unset=True), skip_if_unchanged=True)
+    
     db.commit()
+    cache.invalidate_status()
     db.refresh(component)
     
-    log_action(db, user.user_id, "update", "component", str(component.id), before, data.model_dump(exclude_unset=True))
-    
     return component
 
 
@@ -203,3 +211,4 @@ async def delete_component(
     
     db.delete(component)
     db.commit()
+    cache.invalidate_status()
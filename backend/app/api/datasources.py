@@ -139,11 +139,12 @@ async def create_datasource(
     )
     
     db.add(datasource)
+    db.flush()
+    log_action(db, user.user_id, "create", "datasource", str(datasource.id), None, {"name": data.name, "provider": data.provider_type})
+    
     db.commit()
     db.refresh(datasource)
     
-    log_action(db, user.user_id, "create", "datasource", str(datasource.id), None, {"name": data.name, "provider": data.provider_type})
-    
     return datasource_to_response(datasource)
 
 
@@ -199,12 +200,12 @@ async def update_datasource(
         
         datasource.config_encrypted = encrypt_secret(json.dumps(current_config))
     
-    db.commit()
-    db.refresh(datasource)
-    
     log_action(db, user.user_id, "update", "datasource", str(datasource_id), before, 
                data.model_dump(exclude_unset=True, exclude={"api_key"}))
     
+    db.commit()
+    db.refresh(datasource)
+    
     return datasource_to_response(datasource)
 
 
@@ -246,8 +247,8 @@ async def test_datasource(
             if not api_key:
                 return TestResult(success=False, message="API key not configured")
             
-            client = PagerDutyClient(api_key, base_url=base_url)
-            result = await client.test_connection()
+            async with PagerDutyClient(api_key, base_url=base_url) as client:
+                result = await client.test_connection()
             
             if result["success"]:
                 return TestResult(
@@ -18,6 +18,7 @@ from app.schemas.schemas import (
     IncidentResolveRequest,
 )
 from app.services.audit import log_action
+from app.services.status_overview import refresh_status_overview
 
 
 router = APIRouter(prefix="/incidents", tags=["Incidents"])
@@ -145,15 +146,16 @@ def create_incident(
         )
         db.add(ic)
     
-    db.commit()
-    db.refresh(incident)
-    
     log_action(db, user.user_id, "create", "incident", str(incident.id), None, {
         "title": data.title,
         "severity": data.severity.value,
         "components": [str(c.component_id) for c in data.components],
     })
     
+    db.commit()
+    refresh_status_overview(db)
+    db.refresh(incident)
+    
     return get_incident(incident.id, db)
 
 
@@ -185,14 +187,16 @@ def add_incident_update(
         created_by=user.user_id,
     )
     db.add(update)
-    db.commit()
-    db.refresh(update)
-    
     log_action(db, user.user_id, "update", "incident", str(incident_id), None, {
         "message": data.message,
         "status": new_status.value,
     })
     
+    db.commit()
+    if data.status:
+        refresh_status_overview(db)
+    db.refresh(update)
+    
     return update
 
 
@@ -223,10 +227,11 @@ def resolve_incident(
         created_by=user.user_id,
     )
     db.add(update)
-    db.commit()
-    
     log_action(db, user.user_id, "resolve", "incident", str(incident_id), None, {
         "message": data.message,
     })
     
+    db.commit()
+    refresh_status_overview(db)
+    
     return get_incident(incident_id, db)
@@ -16,6 +16,8 @@ from app.schemas.schemas import (
     MaintenanceDetailResponse, MaintenanceListResponse,
 )
 from app.services.audit import log_action
+from app.services.cache import cache
+from app.services.status_overview import refresh_status_overview
 
 
 router = APIRouter(prefix="/maintenance", tags=["Maintenance"])
@@ -130,15 +132,16 @@ async def create_maintenance(
         )
         db.add(mc)
     
-    db.commit()
-    db.refresh(window)
-    
     log_action(db, user.user_id, "create", "maintenance", str(window.id), None, {
         "title": data.title,
         "start_at": data.start_at.isoformat(),
         "end_at": data.end_at.isoformat(),
     })
     
+    db.commit()
+    cache.invalidate_status()
+    db.refresh(window)
+    
     return get_maintenance(window.id, db)
 
 
@@ -162,11 +165,12 @@ def update_maintenance(
     for key, value in data.model_dump(exclude_unset=True).items():
         setattr(window, key, value)
     
+    log_action(db, user.user_id, "update", "maintenance", str(window.id), before, data.model_dump(exclude_unset=True), skip_if_unchanged=True)
+    
     db.commit()
+    cache.invalidate_status()
     db.refresh(window)
     
-    log_action(db, user.user_id, "update", "maintenance", str(window.id), before, data.model_dump(exclude_unset=True))
-    
     return window
 
 
@@ -185,11 +189,12 @@ async def start_maintenance(
         raise HTTPException(status_code=400, detail="Only scheduled maintenance can be started")
     
     window.status = MaintenanceStatus.IN_PROGRESS
+    log_action(db, user.user_id, "start", "maintenance", str(window.id), None, None)
+    
     db.commit()
+    refresh_status_overview(db)
     db.refresh(window)
     
-    log_action(db, user.user_id, "start", "maintenance", str(window.id), None, None)
-    
     return window
 
 
@@ -208,11 +213,12 @@ async def complete_maintenance(
         raise HTTPException(status_code=400, detail="Only in-progress maintenance can be completed")
     
     window.status = MaintenanceStatus.COMPLETED
+    log_action(db, user.user_id, "complete", "maintenance", str(window.id), None, None)
+    
     db.commit()
+    refresh_status_overview(db)
     db.refresh(window)
     
-    log_action(db, user.user_id, "complete", "maintenance", str(window.id), None, None)
-    
     return window
 
 
@@ -231,9 +237,10 @@ def cancel_maintenance(
         raise HTTPException(status_code=400, detail="Maintenance already completed or canceled")
     
     window.status = MaintenanceStatus.CANCELED
+    log_action(db, user.user_id, "cancel", "maintenance", str(window.id), None, None)
+    
     db.commit()
+    refresh_status_overview(db)
     db.refresh(window)
     
-    log_action(db, user.user_id, "cancel", "maintenance", str(window.id), None, None)
-    
     return window
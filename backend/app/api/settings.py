@@ -172,15 +172,15 @@ async def update_oidc_config(
     if data.issuer_url or data.client_id or data.audience:
         config.is_provisioned = False
     
+    log_action(db, user.user_id, "update", "oidc_config", str(config.id), before, 
+               {k: v for k, v in update_data.items() if "secret" not in k.lower()})
+    
     db.commit()
     db.refresh(config)
     
     # Clear cached OIDC status
     clear_oidc_cache()
     
-    log_action(db, user.user_id, "update", "oidc_config", str(config.id), before, 
-               {k: v for k, v in update_data.items() if "secret" not in k.lower()})
-    
     return config
 
 
@@ -373,11 +373,11 @@ async def update_app_setting(
         db.add(setting)
         before = None
     
+    log_action(db, user.user_id, "update", "app_settings", key, before, {"value": data.value})
+    
     db.commit()
     db.refresh(setting)
     
-    log_action(db, user.user_id, "update", "app_settings", key, before, {"value": data.value})
-    
     return setting
 
 
@@ -8,42 +8,19 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.models.models import (
     Component, ComponentGroup, Incident, MaintenanceWindow,
-    IncidentComponent, MaintenanceComponent,
-    IncidentStatus, MaintenanceStatus, ComponentStatus, Impact
+    IncidentStatus, MaintenanceStatus, ComponentStatus,
 )
 from app.schemas.schemas import (
     StatusOverviewResponse, GroupStatusInfo, ComponentStatusInfo,
     ActiveIncidentSummary, MaintenanceResponse,
 )
+from app.services.cache import cache
+from app.services.status_overview import get_component_statuses
 
 
 router = APIRouter(prefix="/status", tags=["Status"])
 
 
-def compute_component_status(
-    component_id,
-    active_incidents: list,
-    active_maintenance: list,
-) -> ComponentStatus:
-    """Compute the current status of a component based on incidents and maintenance."""
-    # Check for active incidents affecting this component
-    for incident in active_incidents:
-        for ic in incident.incident_components:
-            if ic.component_id == component_id:
-                if ic.impact == Impact.OUTAGE:
-                    return ComponentStatus.MAJOR_OUTAGE
-                elif ic.impact == Impact.DEGRADED:
-                    return ComponentStatus.DEGRADED
-    
-    # Check for active maintenance affecting this component
-    for maint in active_maintenance:
-        for mc in maint.maintenance_components:
-            if mc.component_id == component_id:
-                return ComponentStatus.MAINTENANCE
-    
-    return ComponentStatus.OPERATIONAL
-
-
 def compute_global_status(groups: list[GroupStatusInfo]) -> ComponentStatus:
     """Compute global status based on all component statuses."""
     has_outage = False
@@ -68,22 +45,18 @@ def compute_global_status(groups: list[GroupStatusInfo]) -> ComponentStatus:
     return ComponentStatus.OPERATIONAL
 
 
-@router.get("/overview", response_model=StatusOverviewResponse)
-def get_status_overview(
-    db: Annotated[Session, Depends(get_db)],
-):
-    """Get the global status overview with all components and active incidents."""
+def build_status_overview(db: Session) -> StatusOverviewResponse:
+    """Build the global status overview from the database."""
     # Fetch active incidents (not resolved)
     active_incidents = db.query(Incident)\
         .filter(Incident.status != IncidentStatus.RESOLVED)\
         .order_by(Incident.started_at.desc())\
         .all()
     
-    # Fetch active/upcoming maintenance
+    # Per-component status, precomputed from incidents and maintenance
+    component_statuses_by_id = get_component_statuses(db)
+    
     now = datetime.utcnow()
-    active_maintenance = db.query(MaintenanceWindow)\
-        .filter(MaintenanceWindow.status == MaintenanceStatus.IN_PROGRESS)\
-        .all()
     
     # Fetch upcoming maintenance (next 7 days)
     upcoming_maintenance = db.query(MaintenanceWindow)\
@@ -115,7 +88,7 @@ def get_status_overview(
             ComponentStatusInfo(
                 id=c.id,
                 name=c.name,
-                status=compute_component_status(c.id, active_incidents, active_maintenance),
+                status=component_statuses_by_id.get(c.id, ComponentStatus.OPERATIONAL),
                 tier=c.tier,
             )
             for c in active_components
@@ -134,7 +107,7 @@ def get_status_overview(
             ComponentStatusInfo(
                 id=c.id,
                 name=c.name,
-                status=compute_component_status(c.id, active_incidents, active_maintenance),
+                status=component_statuses_by_id.get(c.id, ComponentStatus.OPERATIONAL),
                 tier=c.tier,
             )
             for c in ungrouped_components
@@ -168,3 +141,15 @@ def get_status_overview(
         upcoming_maintenance=[MaintenanceResponse.model_validate(m) for m in upcoming_maintenance],
         last_updated=now,
     )
+
+
+@router.get("/overview", response_model=StatusOverviewResponse)
+def get_status_overview(
+    db: Annotated[Session, Depends(get_db)],
+):
+    """Get the global status overview with all components and active incidents."""
+    return cache.get_or_compute(
+        cache.STATUS_OVERVIEW_KEY,
+        lambda: build_status_overview(db).model_dump(mode="json"),
+        cache.STATUS_OVERVIEW_TTL,
+    )
@@ -7,18 +7,40 @@ from collections.abc import Generator # Keep this for get_db type hint if it's n
 # from functools import lru_cache # Removed
 
 from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, Session, DeclarativeBase
 
 from app.core.config import get_settings
+from app.core.serialization import dumps, loads
 
 settings = get_settings()
 
+
+def _connect_args(database_url: str) -> dict:
+    """Driver-specific connection arguments."""
+    # psycopg 3 supports server-side prepared statements; psycopg2 does not
+    if make_url(database_url).get_driver_name() == "psycopg":
+        return {"prepare_threshold": settings.db_prepare_threshold}
+    return {}
+
+
+def _json_serializer(value) -> str:
+    """Serialize JSON/JSONB column values with the fast JSON encoder."""
+    return dumps(value).decode("utf-8")
+
+
 # Create sync engine
 engine = create_engine(
     settings.database_url,
     echo=settings.debug,
     pool_size=settings.db_pool_size,
     max_overflow=settings.db_max_overflow,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    pool_recycle=settings.db_pool_recycle,
+    query_cache_size=settings.db_query_cache_size,
+    connect_args=_connect_args(settings.database_url),
+    json_serializer=_json_serializer,
+    json_deserializer=loads,
 )
 
 # Sync session factory
@@ -30,9 +52,18 @@ class Base(DeclarativeBase):
 
 
 def get_db() -> Generator[Session, None, None]:
-    """Dependency for getting DB session."""
+    """
+    Dependency for getting DB session.
+    
+    Anything still pending when the request handler returns (e.g. audit log
+    entries) is committed here; an exception rolls it back.
+    """
     db = SessionLocal()
     try:
         yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
@@ -0,0 +1,28 @@
+"""Fast JSON serialization helpers (orjson with a stdlib fallback)."""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+    def dumps(value: Any) -> bytes:
+        """Serialize a value to JSON bytes; unknown types fall back to str()."""
+        return orjson.dumps(value, default=str, option=_ORJSON_OPTIONS)
+
+    def loads(data: bytes | str) -> Any:
+        """Deserialize JSON from bytes or str."""
+        return orjson.loads(data)
+else:
+    def dumps(value: Any) -> bytes:
+        """Serialize a value to JSON bytes; unknown types fall back to str()."""
+        return json.dumps(value, default=str).encode("utf-8")
+
+    def loads(data: bytes | str) -> Any:
+        """Deserialize JSON from bytes or str."""
+        return json.loads(data)
@@ -1,4 +1,5 @@
 """FastAPI application entry point."""
+import asyncio
 import uuid
 from contextlib import asynccontextmanager
 
@@ -15,6 +16,7 @@ from app.api.auth_local import router as auth_local_router, admin_router as admi
 from app.api.settings import router as settings_router
 from app.api.status_public import router as status_public_router
 from app.api.datasources import router as datasources_router
+from app.services.webhook import webhook
 
 
 settings = get_settings()
@@ -26,8 +28,10 @@ async def lifespan(app: FastAPI):
     # Startup
     # Note: Database schema is managed by Alembic migrations
     # Run: alembic upgrade head
+    webhook.bind_loop(asyncio.get_running_loop())
     yield
-    # Shutdown: cleanup if needed
+    # Shutdown
+    await webhook.close()
 
 
 # OpenAPI schema configuration
@@ -6,11 +6,12 @@ from typing import Optional
 
 from sqlalchemy import (
     Column, String, Text, Integer, Boolean, DateTime, ForeignKey,
-    Enum as SQLEnum, Index
+    Enum as SQLEnum, Index, text
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import relationship, Mapped, mapped_column
+from uuid6 import uuid7
 
 from app.core.database import Base
 
@@ -61,7 +62,7 @@ class ComponentGroup(Base):
     """Logical grouping of components."""
     __tablename__ = "component_group"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     owner_team: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
@@ -80,13 +81,13 @@ class Component(Base):
     """Individual service or component being monitored."""
     __tablename__ = "component"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     group_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("component_group.id"), nullable=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     tier: Mapped[int] = mapped_column(Integer, default=2)  # 0=critical, 1=high, 2=medium, 3=low
     service_owner: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
-    tags: Mapped[dict] = mapped_column(JSONB, default=dict)
+    tags: Mapped[dict] = mapped_column(JSONB, server_default=text("'{}'::jsonb"), nullable=False)
     display_order: Mapped[int] = mapped_column(Integer, default=0)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
@@ -109,7 +110,7 @@ class Incident(Base):
     """Service incident or outage."""
     __tablename__ = "incident"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     severity: Mapped[Severity] = mapped_column(SQLEnum(Severity, values_callable=lambda x: [e.value for e in x]), nullable=False, default=Severity.MINOR)
     status: Mapped[IncidentStatus] = mapped_column(SQLEnum(IncidentStatus, values_callable=lambda x: [e.value for e in x]), nullable=False, default=IncidentStatus.INVESTIGATING)
@@ -134,7 +135,7 @@ class IncidentUpdate(Base):
     """Timeline update for an incident."""
     __tablename__ = "incident_update"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     incident_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("incident.id"), nullable=False)
     message: Mapped[str] = mapped_column(Text, nullable=False)
     status_snapshot: Mapped[IncidentStatus] = mapped_column(SQLEnum(IncidentStatus, values_callable=lambda x: [e.value for e in x]), nullable=False)
@@ -173,7 +174,7 @@ class MaintenanceWindow(Base):
     """Scheduled maintenance window."""
     __tablename__ = "maintenance_window"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     status: Mapped[MaintenanceStatus] = mapped_column(SQLEnum(MaintenanceStatus, values_callable=lambda x: [e.value for e in x]), nullable=False, default=MaintenanceStatus.SCHEDULED)
@@ -207,7 +208,7 @@ class AuditLog(Base):
     """Immutable audit trail of all changes."""
     __tablename__ = "audit_log"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     actor: Mapped[str] = mapped_column(String(255), nullable=False)
     action: Mapped[str] = mapped_column(String(50), nullable=False)  # create, update, delete
     entity_type: Mapped[str] = mapped_column(String(50), nullable=False)  # component, incident, etc.
@@ -229,7 +230,7 @@ class LocalUser(Base):
     """Local admin user for breakglass access when OIDC is unavailable."""
     __tablename__ = "local_user"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     username: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
@@ -264,14 +265,14 @@ class OIDCConfig(Base):
     """OIDC provider configuration for authentication."""
     __tablename__ = "oidc_config"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     provider_name: Mapped[str] = mapped_column(String(100), default="logto")
     enabled: Mapped[bool] = mapped_column(Boolean, default=False)
     issuer_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     client_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     client_secret_encrypted: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     audience: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
-    scopes: Mapped[Optional[list]] = mapped_column(postgresql.ARRAY(String), default=['openid', 'profile', 'email'])
+    scopes: Mapped[Optional[list]] = mapped_column(postgresql.ARRAY(String), server_default=text("ARRAY['openid','profile','email']"))
     redirect_uri: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     admin_endpoint: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     
@@ -293,7 +294,7 @@ class Datasource(Base):
     """External datasource integration (PagerDuty, OpsGenie, etc.)."""
     __tablename__ = "datasource"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     provider_type: Mapped[str] = mapped_column(String(50), nullable=False)  # pagerduty, opsgenie
     config_encrypted: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Encrypted JSON
@@ -318,7 +319,7 @@ class ExternalIncident(Base):
     """Links external incidents to internal incidents."""
     __tablename__ = "external_incident"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     datasource_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("datasource.id", ondelete="CASCADE"), nullable=False)
     external_id: Mapped[str] = mapped_column(String(255), nullable=False)  # PagerDuty incident ID
     incident_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("incident.id", ondelete="CASCADE"), nullable=True)
@@ -13,10 +13,15 @@ def log_action(
     entity_id: str,
     before_state: Optional[dict],
     after_state: Optional[dict],
-) -> AuditLog:
+    skip_if_unchanged: bool = False,
+) -> Optional[AuditLog]:
     """
     Log an action to the audit trail.
     
+    The entry is flushed, not committed: it becomes part of the caller's
+    transaction and is committed (or rolled back) together with the change
+    it describes.
+    
     Args:
         db: Database session
         actor: User ID performing the action
@@ -25,9 +30,11 @@ def log_action(
         entity_id: ID of the entity
         before_state: State before the change (for updates/deletes)
         after_state: State after the change (for creates/updates)
+        skip_if_unchanged: Don't log an update whose before and after states
+            are equal. Only valid when both states cover the same fields.
     
     Returns:
-        The created audit log entry
+        The created audit log entry, or None if skipped as unchanged
     """
     # Convert any non-serializable values
     def serialize(value):
@@ -41,16 +48,23 @@ def log_action(
             return value.value
         return str(value) if not isinstance(value, (str, int, float, bool, list)) else value
     
+    before = serialize(before_state)
+    after = serialize(after_state)
+    
+    # Skip no-op updates (e.g. a re-submitted form with identical fields)
+    if skip_if_unchanged and before is not None and before == after:
+        return None
+    
     log_entry = AuditLog(
         actor=actor,
         action=action,
         entity_type=entity_type,
         entity_id=entity_id,
-        before_state=serialize(before_state),
-        after_state=serialize(after_state),
+        before_state=before,
+        after_state=after,
     )
     
     db.add(log_entry)
-    db.commit()
+    db.flush()
     
     return log_entry
@@ -1,11 +1,14 @@
 """Redis caching service."""
-import json
-from typing import Optional, Any
-from datetime import timedelta
+import fnmatch
+import threading
+import time
+from typing import Callable, Optional, Any
 
 import redis
+from cachetools import TTLCache
 
 from app.core.config import get_settings
+from app.core.serialization import dumps, loads
 
 
 settings = get_settings()
@@ -13,6 +16,27 @@ settings = get_settings()
 # Redis client (lazy initialization)
 _redis_client: Optional[redis.Redis] = None
 
+# Per-process L1 in front of Redis for the hottest keys. Entries live only
+# a couple of seconds, so other workers' writes show up almost at once.
+_l1: TTLCache = TTLCache(maxsize=64, ttl=2)
+_l1_lock = threading.Lock()
+
+
+def _l1_get(key: str) -> Optional[Any]:
+    with _l1_lock:
+        return _l1.get(key)
+
+
+def _l1_set(key: str, value: Any) -> None:
+    with _l1_lock:
+        _l1[key] = value
+
+
+def _l1_discard(*keys: str) -> None:
+    with _l1_lock:
+        for key in keys:
+            _l1.pop(key, None)
+
 
 def get_redis() -> Optional[redis.Redis]:
     """Get Redis client. Returns None if Redis is not configured."""
@@ -23,10 +47,11 @@ def get_redis() -> Optional[redis.Redis]:
     
     if _redis_client is None:
         try:
+            # Values are JSON bytes handed straight to loads(); skip the
+            # UTF-8 decode of every response
             _redis_client = redis.from_url(
                 settings.redis_url,
-                encoding="utf-8",
-                decode_responses=True,
+                decode_responses=False,
             )
             # Test connection
             _redis_client.ping()
@@ -47,6 +72,14 @@ class CacheService:
     STATUS_OVERVIEW_TTL = 30  # 30 seconds
     COMPONENT_TTL = 60  # 1 minute
     
+    # Keys per SCAN step / DELETE call in delete_pattern()
+    SCAN_BATCH_SIZE = 500
+    
+    # Single-flight recompute lock for get_or_compute()
+    LOCK_TTL = 5  # seconds
+    LOCK_WAIT_ATTEMPTS = 10
+    LOCK_WAIT_INTERVAL = 0.05  # seconds
+    
     def __init__(self):
         self.redis = get_redis()
     
@@ -60,34 +93,100 @@ class CacheService:
         if not self.enabled:
             return None
         
+        value = _l1_get(key)
+        if value is not None:
+            return value
+        
         try:
             data = self.redis.get(key)
             if data:
-                return json.loads(data)
+                value = loads(data)
+                _l1_set(key, value)
+                return value
         except Exception:
             pass
         return None
     
+    def mget(self, keys: list[str]) -> list[Optional[Any]]:
+        """Get several cached values in one round trip; misses are None."""
+        if not self.enabled or not keys:
+            return [None] * len(keys)
+        
+        try:
+            return [loads(data) if data else None for data in self.redis.mget(keys)]
+        except Exception:
+            return [None] * len(keys)
+    
     def set(self, key: str, value: Any, ttl: int = 60) -> bool:
         """Set a cached value with TTL in seconds."""
         if not self.enabled:
             return False
         
+        _l1_discard(key)
         try:
-            self.redis.setex(
-                key,
-                timedelta(seconds=ttl),
-                json.dumps(value, default=str),
-            )
+            self.redis.setex(key, ttl, dumps(value))
             return True
         except Exception:
             return False
     
+    def set_many(self, values: dict[str, Any], ttl: int = 60) -> bool:
+        """Set several cached values with the same TTL in one round trip."""
+        if not self.enabled:
+            return False
+        
+        _l1_discard(*values)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, value in values.items():
+                pipe.setex(key, ttl, dumps(value))
+            pipe.execute()
+            return True
+        except Exception:
+            return False
+    
+    def get_or_compute(self, key: str, compute_fn: Callable[[], Any], ttl: int = 60) -> Any:
+        """
+        Get a cached value, computing and caching it on a miss.
+        
+        Only one caller recomputes an expired key: it takes a short lock
+        while the others wait briefly for its result, falling back to
+        computing themselves if it doesn't arrive in time.
+        """
+        if not self.enabled:
+            return compute_fn()
+        
+        value = _l1_get(key)
+        if value is not None:
+            return value
+        
+        try:
+            data = self.redis.get(key)
+            if data:
+                value = loads(data)
+                _l1_set(key, value)
+                return value
+            
+            if self.redis.set(f"{key}:lock", b"1", nx=True, ex=self.LOCK_TTL):
+                value = compute_fn()
+                self.redis.setex(key, ttl, dumps(value))
+                self.redis.delete(f"{key}:lock")
+                return value
+            
+            for _ in range(self.LOCK_WAIT_ATTEMPTS):
+                time.sleep(self.LOCK_WAIT_INTERVAL)
+                data = self.redis.get(key)
+                if data:
+                    return loads(data)
+        except redis.RedisError:
+            pass
+        return compute_fn()
+    
     def delete(self, key: str) -> bool:
         """Delete a cached value."""
         if not self.enabled:
             return False
         
+        _l1_discard(key)
         try:
             self.redis.delete(key)
             return True
@@ -99,10 +198,20 @@ class CacheService:
         if not self.enabled:
             return False
         
+        with _l1_lock:
+            for key in [k for k in _l1.keys() if fnmatch.fnmatchcase(k, pattern)]:
+                _l1.pop(key, None)
+        
         try:
-            keys = self.redis.keys(pattern)
-            if keys:
-                self.redis.delete(*keys)
+            # SCAN instead of KEYS so a large keyspace doesn't block Redis
+            batch = []
+            for key in self.redis.scan_iter(match=pattern, count=self.SCAN_BATCH_SIZE):
+                batch.append(key)
+                if len(batch) >= self.SCAN_BATCH_SIZE:
+                    self.redis.delete(*batch)
+                    batch.clear()
+            if batch:
+                self.redis.delete(*batch)
             return True
         except Exception:
             return False
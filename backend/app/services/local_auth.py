@@ -1,24 +1,54 @@
 """Local authentication service for breakglass admin access."""
-import uuid
-from datetime import datetime, timedelta, timezone
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import threading
+from datetime import datetime, timezone
 from typing import Optional
 
 import bcrypt
 import jwt
+from cachetools import TTLCache
 from sqlalchemy.orm import Session
+from uuid6 import uuid7
 
 from app.core.config import settings
+from app.core.serialization import dumps
 from app.models.models import LocalUser
 
 # JWT settings for local auth
-LOCAL_JWT_SECRET = settings.database_url[:32]  # Use a portion of DB URL as secret (should be a proper secret)
+# Signing key derived from the full DB URL (should be a proper secret)
+LOCAL_JWT_SECRET = hashlib.sha256(settings.database_url.encode("utf-8")).digest()
 LOCAL_JWT_ALGORITHM = "HS256"
 LOCAL_JWT_EXPIRE_HOURS = 24
 
+# Recently verified (password, hash) pairs, so repeated logins within the
+# TTL skip bcrypt. Keys are an HMAC of the password under a random
+# per-process key, never the password itself. Only successes are cached:
+# a wrong password always pays the full bcrypt cost.
+_VERIFY_CACHE_KEY = os.urandom(32)
+_verified_passwords: TTLCache = TTLCache(maxsize=1024, ttl=60)
+_verified_passwords_lock = threading.Lock()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    cache_key = (
+        hmac.new(_VERIFY_CACHE_KEY, plain_password.encode('utf-8'), hashlib.sha256).digest(),
+        hashed_password,
+    )
+    with _verified_passwords_lock:
+        if cache_key in _verified_passwords:
+            return True
+    
+    if not bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8')):
+        return False
+    
+    with _verified_passwords_lock:
+        _verified_passwords[cache_key] = True
+    return True
 
 
 def hash_password(password: str) -> str:
@@ -26,9 +56,44 @@ def hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in a worker thread so bcrypt doesn't block the event loop."""
+    return await asyncio.to_thread(verify_password, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password in a worker thread so bcrypt doesn't block the event loop."""
+    return await asyncio.to_thread(hash_password, password)
+
+
+def _b64url(data: bytes) -> bytes:
+    """Unpadded base64url encoding, as used in JWT segments."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# Local tokens always use the same header, so encode it once
+_JWT_HEADER_SEGMENT = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+
+# Keyed HMAC state, copied per signature instead of re-keying each time
+_MAC_PROTO = hmac.new(LOCAL_JWT_SECRET, None, hashlib.sha256)
+
+
+def _sign(message: bytes) -> bytes:
+    """HMAC-SHA256 a message with the local JWT key."""
+    mac = _MAC_PROTO.copy()
+    mac.update(message)
+    return mac.digest()
+
+
+def _encode_hs256(payload: dict) -> str:
+    """Encode and sign an HS256 JWT; payload must already be JSON-native."""
+    signing_input = _JWT_HEADER_SEGMENT + b"." + _b64url(dumps(payload))
+    return (signing_input + b"." + _b64url(_sign(signing_input))).decode("ascii")
+
+
 def create_local_token(user: LocalUser) -> str:
     """Create a JWT token for a local user."""
-    expire = datetime.now(timezone.utc) + timedelta(hours=LOCAL_JWT_EXPIRE_HOURS)
+    now = int(datetime.now(timezone.utc).timestamp())
     payload = {
         "sub": str(user.id),
         "username": user.username,
@@ -36,16 +101,21 @@ def create_local_token(user: LocalUser) -> str:
         "name": user.display_name or user.username,
         "is_superadmin": user.is_superadmin,
         "type": "local",  # Distinguish from OIDC tokens
-        "exp": expire,
-        "iat": datetime.now(timezone.utc),
+        "exp": now + LOCAL_JWT_EXPIRE_HOURS * 3600,
+        "iat": now,
     }
-    return jwt.encode(payload, LOCAL_JWT_SECRET, algorithm=LOCAL_JWT_ALGORITHM)
+    return _encode_hs256(payload)
 
 
 def verify_local_token(token: str) -> Optional[dict]:
     """Verify a local JWT token and return the payload."""
     try:
-        payload = jwt.decode(token, LOCAL_JWT_SECRET, algorithms=[LOCAL_JWT_ALGORITHM])
+        payload = jwt.decode(
+            token,
+            LOCAL_JWT_SECRET,
+            algorithms=[LOCAL_JWT_ALGORITHM],
+            options={"require": ["exp", "iat", "type"]},
+        )
         if payload.get("type") != "local":
             return None
         return payload
@@ -53,36 +123,57 @@ def verify_local_token(token: str) -> Optional[dict]:
         return None
 
 
+def _get_active_user(db: Session, username: str) -> Optional[LocalUser]:
+    """Look up an active local user by username."""
+    user = db.query(LocalUser).filter(LocalUser.username == username).first()
+    if not user or not user.is_active:
+        return None
+    return user
+
+
+def _record_login(db: Session, user: LocalUser) -> None:
+    """Update the user's last login time."""
+    user.last_login = datetime.now(timezone.utc)
+    db.commit()
+
+
 def authenticate_user(db: Session, username: str, password: str) -> Optional[LocalUser]:
     """Authenticate a user by username and password."""
-    user = db.query(LocalUser).filter(LocalUser.username == username).first()
+    user = _get_active_user(db, username)
     if not user:
         return None
-    if not user.is_active:
-        return None
     if not verify_password(password, user.password_hash):
         return None
     
-    # Update last login
-    user.last_login = datetime.now(timezone.utc)
-    db.commit()
+    _record_login(db, user)
+    return user
+
+
+async def authenticate_user_async(db: Session, username: str, password: str) -> Optional[LocalUser]:
+    """Authenticate a user, running the password check off the event loop."""
+    user = _get_active_user(db, username)
+    if not user:
+        return None
+    if not await verify_password_async(password, user.password_hash):
+        return None
     
+    _record_login(db, user)
     return user
 
 
-def create_local_user(
+def _add_local_user(
     db: Session,
     username: str,
-    password: str,
-    email: Optional[str] = None,
-    display_name: Optional[str] = None,
-    is_superadmin: bool = False,
+    password_hash: str,
+    email: Optional[str],
+    display_name: Optional[str],
+    is_superadmin: bool,
 ) -> LocalUser:
-    """Create a new local user."""
+    """Insert a local user with an already-hashed password."""
     user = LocalUser(
-        id=uuid.uuid4(),
+        id=uuid7(),
         username=username,
-        password_hash=hash_password(password),
+        password_hash=password_hash,
         email=email,
         display_name=display_name or username,
         is_superadmin=is_superadmin,
@@ -94,12 +185,43 @@ def create_local_user(
     return user
 
 
+def create_local_user(
+    db: Session,
+    username: str,
+    password: str,
+    email: Optional[str] = None,
+    display_name: Optional[str] = None,
+    is_superadmin: bool = False,
+) -> LocalUser:
+    """Create a new local user."""
+    return _add_local_user(db, username, hash_password(password), email, display_name, is_superadmin)
+
+
+async def create_local_user_async(
+    db: Session,
+    username: str,
+    password: str,
+    email: Optional[str] = None,
+    display_name: Optional[str] = None,
+    is_superadmin: bool = False,
+) -> LocalUser:
+    """Create a new local user, hashing the password off the event loop."""
+    password_hash = await hash_password_async(password)
+    return _add_local_user(db, username, password_hash, email, display_name, is_superadmin)
+
+
 def update_local_user_password(db: Session, user: LocalUser, new_password: str) -> None:
     """Update a user's password."""
     user.password_hash = hash_password(new_password)
     db.commit()
 
 
+async def update_local_user_password_async(db: Session, user: LocalUser, new_password: str) -> None:
+    """Update a user's password, hashing it off the event loop."""
+    user.password_hash = await hash_password_async(new_password)
+    db.commit()
+
+
 def get_or_create_initial_admin(db: Session) -> Optional[LocalUser]:
     """Get or create the initial admin user from environment variables."""
     import os
@@ -1,17 +1,33 @@
 """PagerDuty API client and sync service."""
 import json
 from datetime import datetime, timezone
-from typing import Optional
+from typing import AsyncIterator, Optional
 from uuid import UUID
 
 import httpx
-from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, selectinload
+from uuid6 import uuid7
 
+from app.core.serialization import loads
 from app.models.models import Datasource, ExternalIncident, Incident, Severity, IncidentStatus
+from app.services.status_overview import refresh_status_overview
+
+
+# Incidents per page when paginating /incidents
+PAGE_SIZE = 100
+
+# Commit the sync transaction every N incidents to bound its size
+SYNC_COMMIT_BATCH = 200
 
 
 class PagerDutyClient:
-    """Client for PagerDuty REST API v2."""
+    """
+    Client for PagerDuty REST API v2.
+    
+    Holds a pooled HTTP/2 connection; use as an async context manager (or
+    call aclose()) so consecutive requests reuse one handshake.
+    """
     
     DEFAULT_BASE_URL = "https://api.pagerduty.com"
     
@@ -23,42 +39,59 @@ class PagerDutyClient:
             "Content-Type": "application/json",
             "Accept": "application/vnd.pagerduty+json;version=2",
         }
-
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            http2=True,
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self._client.aclose()
+    
+    async def __aenter__(self) -> "PagerDutyClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
     
     async def test_connection(self) -> dict:
         """Test the API connection by getting current user."""
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.get(
-                f"{self.base_url}/users/me",
-                headers=self.headers,
-            )
-            if response.status_code == 200:
-                user = response.json().get("user", {})
-                return {
-                    "success": True,
-                    "user": user.get("name"),
-                    "email": user.get("email"),
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"HTTP {response.status_code}: {response.text[:200]}",
-                }
+        response = await self._client.get("/users/me", timeout=15.0)
+        if response.status_code == 200:
+            user = response.json().get("user", {})
+            return {
+                "success": True,
+                "user": user.get("name"),
+                "email": user.get("email"),
+            }
+        else:
+            return {
+                "success": False,
+                "error": f"HTTP {response.status_code}: {response.text[:200]}",
+            }
     
-    async def get_incidents(
+    async def iter_incident_pages(
         self,
         statuses: list[str] = None,
         service_ids: list[str] = None,
         since: datetime = None,
-        limit: int = 100,
-    ) -> list[dict]:
-        """Fetch incidents from PagerDuty."""
+        page_size: int = PAGE_SIZE,
+        max_results: Optional[int] = None,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Iterate over pages of incidents from PagerDuty, newest first.
+        
+        Pages are fetched lazily with offset pagination until PagerDuty
+        reports no more results or max_results incidents have been yielded.
+        """
         if statuses is None:
             statuses = ["triggered", "acknowledged"]
         
         params = {
             "statuses[]": statuses,
-            "limit": limit,
             "sort_by": "created_at:desc",
         }
         
@@ -68,32 +101,78 @@ class PagerDutyClient:
         if since:
             params["since"] = since.isoformat()
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{self.base_url}/incidents",
-                headers=self.headers,
-                params=params,
-            )
+        offset = 0
+        yielded = 0
+        while True:
+            limit = page_size
+            if max_results is not None:
+                limit = min(page_size, max_results - yielded)
+            params["limit"] = limit
+            params["offset"] = offset
+            response = await self._client.get("/incidents", params=params)
             
             if response.status_code != 200:
                 raise Exception(f"PagerDuty API error: {response.status_code}")
             
-            return response.json().get("incidents", [])
+            body = loads(response.content)
+            incidents = body.get("incidents", [])
+            if max_results is not None:
+                incidents = incidents[:max_results - yielded]
+            if incidents:
+                yield incidents
+                yielded += len(incidents)
+            
+            if not body.get("more") or (max_results is not None and yielded >= max_results):
+                return
+            offset += limit
+    
+    async def get_incidents(self, **kwargs) -> AsyncIterator[dict]:
+        """Iterate over incidents from PagerDuty; see iter_incident_pages()."""
+        async for page in self.iter_incident_pages(**kwargs):
+            for incident in page:
+                yield incident
+
+
+# PagerDuty urgency/status -> local enums
+_PD_SEVERITY = {"high": Severity.CRITICAL}
+_PD_STATUS = {
+    "triggered": IncidentStatus.INVESTIGATING,
+    "acknowledged": IncidentStatus.IDENTIFIED,
+    "resolved": IncidentStatus.RESOLVED,
+}
 
 
 def map_pd_severity(urgency: str) -> Severity:
     """Map PagerDuty urgency to our severity."""
-    return Severity.CRITICAL if urgency == "high" else Severity.MAJOR
+    return _PD_SEVERITY.get(urgency, Severity.MAJOR)
 
 
 def map_pd_status(status: str) -> IncidentStatus:
     """Map PagerDuty status to our status."""
-    mapping = {
-        "triggered": IncidentStatus.INVESTIGATING,
-        "acknowledged": IncidentStatus.IDENTIFIED,
-        "resolved": IncidentStatus.RESOLVED,
-    }
-    return mapping.get(status, IncidentStatus.INVESTIGATING)
+    return _PD_STATUS.get(status, IncidentStatus.INVESTIGATING)
+
+
+def _parse_pd_ts(value: str) -> datetime:
+    """Parse a PagerDuty ISO-8601 timestamp ("...Z" suffix) to an aware datetime."""
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def _load_external_incidents(
+    db: Session,
+    datasource: Datasource,
+    pd_incidents: list[dict],
+) -> dict[str, ExternalIncident]:
+    """Load already-synced external incidents for a page, keyed by PagerDuty ID."""
+    rows = db.query(ExternalIncident)\
+        .options(selectinload(ExternalIncident.incident))\
+        .filter(
+            ExternalIncident.datasource_id == datasource.id,
+            ExternalIncident.external_id.in_([i["id"] for i in pd_incidents]),
+        )\
+        .all()
+    return {row.external_id: row for row in rows}
 
 
 async def sync_pagerduty_incidents(db: Session, datasource: Datasource) -> dict:
@@ -122,89 +201,92 @@ async def sync_pagerduty_incidents(db: Session, datasource: Datasource) -> dict:
     db.commit()
     
     try:
-        client = PagerDutyClient(api_key, base_url=base_url)
-        
-        # Fetch active incidents
-        incidents = await client.get_incidents(
-            statuses=["triggered", "acknowledged"],
-            service_ids=service_ids if service_ids else None,
-        )
-        
+        sync_now = datetime.now(timezone.utc)
         created = 0
         updated = 0
+        fetched = 0
+        uncommitted = 0
         
-        for pd_incident in incidents:
-            pd_id = pd_incident["id"]
-            
-            # Check if we already have this incident
-            existing = db.query(ExternalIncident).filter(
-                ExternalIncident.datasource_id == datasource.id,
-                ExternalIncident.external_id == pd_id,
-            ).first()
-            
-            if existing:
-                # Update existing incident
-                if existing.incident:
-                    existing.incident.title = pd_incident["title"]
-                    existing.incident.severity = map_pd_severity(pd_incident.get("urgency", "high"))
-                    existing.incident.status = map_pd_status(pd_incident["status"])
-                    if pd_incident["status"] == "resolved" and pd_incident.get("resolved_at"):
-                        existing.incident.resolved_at = datetime.fromisoformat(
-                            pd_incident["resolved_at"].replace("Z", "+00:00")
-                        )
-                existing.raw_data = pd_incident
-                existing.synced_at = datetime.now(timezone.utc)
-                updated += 1
-            else:
-                # Create new incident
-                incident = Incident(
-                    title=pd_incident["title"],
-                    severity=map_pd_severity(pd_incident.get("urgency", "high")),
-                    status=map_pd_status(pd_incident["status"]),
-                    started_at=datetime.fromisoformat(
-                        pd_incident["created_at"].replace("Z", "+00:00")
-                    ),
-                    source="pagerduty",
-                    created_by=f"pagerduty:{datasource.name}",
-                )
-                db.add(incident)
-                db.flush()  # Get the ID
+        async with PagerDutyClient(api_key, base_url=base_url) as client:
+            # Fetch active incidents
+            async for page in client.iter_incident_pages(
+                statuses=["triggered", "acknowledged"],
+                service_ids=service_ids if service_ids else None,
+            ):
+                fetched += len(page)
+                existing_by_id = _load_external_incidents(db, datasource, page)
+                new_incidents = []
+                new_externals = {}
                 
-                # Create external incident link
-                external = ExternalIncident(
-                    datasource_id=datasource.id,
-                    external_id=pd_id,
-                    incident_id=incident.id,
-                    external_url=pd_incident.get("html_url"),
-                    raw_data=pd_incident,
-                    synced_at=datetime.now(timezone.utc),
-                )
-                db.add(external)
-                created += 1
-        
-        # Also sync resolved incidents (to update status)
-        resolved_incidents = await client.get_incidents(
-            statuses=["resolved"],
-            service_ids=service_ids if service_ids else None,
-            limit=50,
-        )
-        
-        for pd_incident in resolved_incidents:
-            pd_id = pd_incident["id"]
-            existing = db.query(ExternalIncident).filter(
-                ExternalIncident.datasource_id == datasource.id,
-                ExternalIncident.external_id == pd_id,
-            ).first()
+                for pd_incident in page:
+                    pd_id = pd_incident["id"]
+                    existing = existing_by_id.get(pd_id)
+                    
+                    if existing:
+                        # Update existing incident
+                        if existing.incident:
+                            existing.incident.title = pd_incident["title"]
+                            existing.incident.severity = map_pd_severity(pd_incident.get("urgency", "high"))
+                            existing.incident.status = map_pd_status(pd_incident["status"])
+                            if pd_incident["status"] == "resolved" and pd_incident.get("resolved_at"):
+                                existing.incident.resolved_at = _parse_pd_ts(pd_incident["resolved_at"])
+                        existing.raw_data = pd_incident
+                        existing.synced_at = sync_now
+                        updated += 1
+                    elif pd_id not in new_externals:
+                        # New incident: ids are generated here so both rows
+                        # can go out as one bulk INSERT each per page
+                        incident_id = uuid7()
+                        new_incidents.append({
+                            "id": incident_id,
+                            "title": pd_incident["title"],
+                            "severity": map_pd_severity(pd_incident.get("urgency", "high")),
+                            "status": map_pd_status(pd_incident["status"]),
+                            "started_at": _parse_pd_ts(pd_incident["created_at"]),
+                            "source": "pagerduty",
+                            "created_by": f"pagerduty:{datasource.name}",
+                        })
+                        new_externals[pd_id] = {
+                            "id": uuid7(),
+                            "datasource_id": datasource.id,
+                            "external_id": pd_id,
+                            "incident_id": incident_id,
+                            "external_url": pd_incident.get("html_url"),
+                            "raw_data": pd_incident,
+                            "synced_at": sync_now,
+                        }
+                        created += 1
+                
+                if new_incidents:
+                    db.execute(insert(Incident), new_incidents)
+                    db.execute(insert(ExternalIncident), list(new_externals.values()))
+                db.flush()
+                uncommitted += len(page)
+                if uncommitted >= SYNC_COMMIT_BATCH:
+                    db.commit()
+                    uncommitted = 0
             
-            if existing and existing.incident:
-                existing.incident.status = IncidentStatus.RESOLVED
-                if pd_incident.get("resolved_at"):
-                    existing.incident.resolved_at = datetime.fromisoformat(
-                        pd_incident["resolved_at"].replace("Z", "+00:00")
-                    )
-                existing.raw_data = pd_incident
-                existing.synced_at = datetime.now(timezone.utc)
-                updated += 1
+            # Also sync recently resolved incidents (to update status)
+            async for page in client.iter_incident_pages(
+                statuses=["resolved"],
+                service_ids=service_ids if service_ids else None,
+                max_results=50,
+            ):
+                fetched += len(page)
+                existing_by_id = _load_external_incidents(db, datasource, page)
+                
+                for pd_incident in page:
+                    existing = existing_by_id.get(pd_incident["id"])
+                    
+                    if existing and existing.incident:
+                        existing.incident.status = IncidentStatus.RESOLVED
+                        if pd_incident.get("resolved_at"):
+                            existing.incident.resolved_at = _parse_pd_ts(pd_incident["resolved_at"])
+                        existing.raw_data = pd_incident
+                        existing.synced_at = sync_now
+                        updated += 1
+                
+                db.flush()
         
         # Update datasource status
         datasource.sync_status = "success"
@@ -212,11 +294,14 @@ async def sync_pagerduty_incidents(db: Session, datasource: Datasource) -> dict:
         datasource.sync_error = None
         db.commit()
         
+        if created or updated:
+            refresh_status_overview(db)
+        
         return {
             "success": True,
             "created": created,
             "updated": updated,
-            "total_fetched": len(incidents) + len(resolved_incidents),
+            "total_fetched": fetched,
         }
         
     except Exception as e:
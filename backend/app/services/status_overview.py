@@ -0,0 +1,39 @@
+"""Materialized status overview service."""
+from uuid import UUID
+
+from sqlalchemy import String, text
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Session
+
+from app.models.models import ComponentStatus
+from app.services.cache import cache
+
+
+_SELECT_STATUSES = text(
+    "SELECT component_id, status FROM status_overview_mv"
+).columns(component_id=PGUUID(as_uuid=True), status=String)
+
+_REFRESH = text("REFRESH MATERIALIZED VIEW CONCURRENTLY status_overview_mv")
+
+
+def get_component_statuses(db: Session) -> dict[UUID, ComponentStatus]:
+    """
+    Get the current status of every component from the materialized view.
+    
+    Components created since the last refresh are absent; callers should
+    treat them as operational.
+    """
+    rows = db.execute(_SELECT_STATUSES).all()
+    return {row.component_id: ComponentStatus(row.status) for row in rows}
+
+
+def refresh_status_overview(db: Session) -> None:
+    """
+    Refresh the status overview after incidents or maintenance change.
+    
+    Call after the change has been committed so the view sees it. Also
+    drops the cached overview response.
+    """
+    db.execute(_REFRESH)
+    db.commit()
+    cache.invalidate_status()
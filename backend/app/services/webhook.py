@@ -1,19 +1,57 @@
 """Webhook notification service for Slack and other integrations."""
 import asyncio
-import json
-from typing import Optional
-from datetime import datetime
+import concurrent.futures
+import re
+import time
+from typing import Final, Optional, Union
 import logging
 
 import aiohttp
 
 from app.core.config import get_settings
+from app.core.serialization import dumps
 from app.models.models import Incident, MaintenanceWindow, Severity, IncidentStatus
 
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_SEVERITY_COLORS: Final[dict[Severity, str]] = {
+    Severity.CRITICAL: "#dc2626",  # Red
+    Severity.MAJOR: "#ea580c",     # Orange
+    Severity.MINOR: "#d97706",     # Amber
+    Severity.INFO: "#0891b2",      # Cyan
+}
+
+_STATUS_EMOJIS: Final[dict[IncidentStatus, str]] = {
+    IncidentStatus.INVESTIGATING: "🔍",
+    IncidentStatus.IDENTIFIED: "🔎",
+    IncidentStatus.MONITORING: "👀",
+    IncidentStatus.RESOLVED: "✅",
+}
+
+# Placeholders in pre-serialized payload templates. "__TS__" stands in for a
+# whole JSON value (quotes included); the others sit inside string values.
+_TEMPLATE_FIELD = re.compile(rb'"__TS__"|__(?:TITLE|STATUS|MESSAGE|COMPONENTS)__')
+
+
+def _json_fragment(value: str) -> bytes:
+    """JSON-escape a string for splicing inside an existing JSON string."""
+    return dumps(value)[1:-1]
+
+
+def _format_duration(seconds: int) -> str:
+    """Format a duration as "1h 5m", or "5m" under an hour."""
+    hours, minutes = divmod(seconds // 60, 60)
+    return f"{hours}h {minutes}m" if hours > 0 else f"{minutes}m"
+
+
+def _render_template(template: bytes, fields: dict[bytes, bytes]) -> bytes:
+    """Fill all template placeholders in a single pass."""
+    return _TEMPLATE_FIELD.sub(lambda m: fields[m.group()], template)
+
 
 class WebhookService:
     """Service for sending webhook notifications."""
@@ -21,6 +59,43 @@ class WebhookService:
     def __init__(self):
         self.slack_webhook_url: Optional[str] = getattr(settings, 'slack_webhook_url', None)
         self.custom_webhook_urls: list[str] = getattr(settings, 'custom_webhook_urls', [])
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Loop the session was created on; a session can't be used from another
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Application event loop, set at startup so sync code can schedule sends
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Strong references to in-flight sends scheduled by send_notification()
+        self._pending: set[concurrent.futures.Future] = set()
+        self._incident_created_templates: dict[Severity, bytes] = {
+            severity: self._build_incident_created_template(severity)
+            for severity in Severity
+        }
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use on this loop."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10),
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60),
+            )
+            self._session_loop = loop
+        return self._session
+    
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Set the event loop that send_notification() schedules onto."""
+        self._loop = loop
+    
+    async def close(self) -> None:
+        """Close the shared HTTP session if it belongs to the running loop."""
+        if (
+            self._session is not None
+            and not self._session.closed
+            and self._session_loop is asyncio.get_running_loop()
+        ):
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
     
     @property
     def enabled(self) -> bool:
@@ -29,61 +104,21 @@ class WebhookService:
     
     def _get_severity_color(self, severity: Severity) -> str:
         """Get Slack color for severity level."""
-        colors = {
-            Severity.CRITICAL: "#dc2626",  # Red
-            Severity.MAJOR: "#ea580c",     # Orange
-            Severity.MINOR: "#d97706",     # Amber
-            Severity.INFO: "#0891b2",      # Cyan
-        }
-        return colors.get(severity, "#6366f1")
+        return _SEVERITY_COLORS.get(severity, "#6366f1")
     
     def _get_status_emoji(self, status: IncidentStatus) -> str:
         """Get emoji for incident status."""
-        emojis = {
-            IncidentStatus.INVESTIGATING: "🔍",
-            IncidentStatus.IDENTIFIED: "🔎",
-            IncidentStatus.MONITORING: "👀",
-            IncidentStatus.RESOLVED: "✅",
-        }
-        return emojis.get(status, "⚠️")
+        return _STATUS_EMOJIS.get(status, "⚠️")
     
-    async def send_slack_message(self, payload: dict) -> bool:
-        """Send a message to Slack webhook."""
-        if not self.slack_webhook_url:
-            return False
-        
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.slack_webhook_url,
-                    json=payload,
-                    headers={"Content-Type": "application/json"},
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as response:
-                    return response.status == 200
-        except Exception as e:
-            logger.error(f"Failed to send Slack message: {e}")
-            return False
-    
-    async def notify_incident_created(
-        self, 
-        incident: Incident, 
-        initial_message: str,
-        affected_components: list[str],
-    ) -> bool:
-        """Send notification when a new incident is created."""
-        if not self.enabled:
-            return False
-        
-        emoji = self._get_severity_color(incident.severity)
-        
-        payload = {
+    def _build_incident_created_template(self, severity: Severity) -> bytes:
+        """Serialize the incident-created payload for one severity, leaving placeholders."""
+        return dumps({
             "blocks": [
                 {
                     "type": "header",
                     "text": {
                         "type": "plain_text",
-                        "text": f"🚨 New Incident: {incident.title}",
+                        "text": "🚨 New Incident: __TITLE__",
                         "emoji": True,
                     }
                 },
@@ -92,11 +127,11 @@ class WebhookService:
                     "fields": [
                         {
                             "type": "mrkdwn",
-                            "text": f"*Severity:* {incident.severity.value.upper()}"
+                            "text": f"*Severity:* {severity.value.upper()}"
                         },
                         {
                             "type": "mrkdwn",
-                            "text": f"*Status:* {incident.status.value.replace('_', ' ').title()}"
+                            "text": "*Status:* __STATUS__"
                         }
                     ]
                 },
@@ -104,27 +139,76 @@ class WebhookService:
                     "type": "section",
                     "text": {
                         "type": "mrkdwn",
-                        "text": f"*Initial Update:*\n{initial_message}"
+                        "text": "*Initial Update:*\n__MESSAGE__"
                     }
                 },
             ],
             "attachments": [
                 {
-                    "color": self._get_severity_color(incident.severity),
+                    "color": self._get_severity_color(severity),
                     "fields": [
                         {
                             "title": "Affected Components",
-                            "value": ", ".join(affected_components) if affected_components else "None specified",
+                            "value": "__COMPONENTS__",
                             "short": False,
                         }
                     ],
                     "footer": "Status Page",
-                    "ts": int(datetime.utcnow().timestamp()),
+                    "ts": "__TS__",
                 }
             ]
-        }
+        })
+    
+    async def _post_one(self, url: str, body: bytes) -> bool:
+        """POST a serialized JSON body to one webhook URL."""
+        try:
+            session = await self._get_session()
+            async with session.post(url, data=body, headers=_JSON_HEADERS) as response:
+                return response.status == 200
+        except Exception as e:
+            logger.error(f"Failed to send webhook to {url}: {e}")
+            return False
+    
+    async def send_slack_message(self, payload: dict) -> bool:
+        """Send a message to Slack webhook."""
+        if not self.slack_webhook_url:
+            return False
+        return await self._post_one(self.slack_webhook_url, dumps(payload))
+    
+    async def _broadcast(self, payload: Union[dict, bytes]) -> bool:
+        """Send a payload to Slack and all custom webhooks concurrently."""
+        urls = ([self.slack_webhook_url] if self.slack_webhook_url else []) + self.custom_webhook_urls
+        if not urls:
+            return False
+        # Serialize once for every destination
+        body = payload if isinstance(payload, bytes) else dumps(payload)
+        results = await asyncio.gather(
+            *(self._post_one(url, body) for url in urls),
+            return_exceptions=True,
+        )
+        return all(r is True for r in results)
+    
+    async def notify_incident_created(
+        self, 
+        incident: Incident, 
+        initial_message: str,
+        affected_components: list[str],
+    ) -> bool:
+        """Send notification when a new incident is created."""
+        if not self.enabled:
+            return False
         
-        return await self.send_slack_message(payload)
+        payload = _render_template(self._incident_created_templates[incident.severity], {
+            b"__TITLE__": _json_fragment(incident.title),
+            b"__STATUS__": _json_fragment(incident.status.value.replace('_', ' ').title()),
+            b"__MESSAGE__": _json_fragment(initial_message),
+            b"__COMPONENTS__": _json_fragment(
+                ", ".join(affected_components) if affected_components else "None specified"
+            ),
+            b'"__TS__"': str(int(time.time())).encode(),
+        })
+        
+        return await self._broadcast(payload)
     
     async def notify_incident_updated(
         self,
@@ -166,7 +250,7 @@ class WebhookService:
             ]
         }
         
-        return await self.send_slack_message(payload)
+        return await self._broadcast(payload)
     
     async def notify_incident_resolved(
         self,
@@ -180,12 +264,7 @@ class WebhookService:
         duration = ""
         if incident.resolved_at and incident.started_at:
             delta = incident.resolved_at - incident.started_at
-            hours, remainder = divmod(int(delta.total_seconds()), 3600)
-            minutes, _ = divmod(remainder, 60)
-            if hours > 0:
-                duration = f"{hours}h {minutes}m"
-            else:
-                duration = f"{minutes}m"
+            duration = _format_duration(int(delta.total_seconds()))
         
         payload = {
             "blocks": [
@@ -222,12 +301,12 @@ class WebhookService:
                 {
                     "color": "#10b981",  # Green
                     "footer": "Status Page",
-                    "ts": int(datetime.utcnow().timestamp()),
+                    "ts": int(time.time()),
                 }
             ]
         }
         
-        return await self.send_slack_message(payload)
+        return await self._broadcast(payload)
     
     async def notify_maintenance_scheduled(
         self,
@@ -273,12 +352,12 @@ class WebhookService:
                         }
                     ],
                     "footer": "Status Page",
-                    "ts": int(datetime.utcnow().timestamp()),
+                    "ts": int(time.time()),
                 }
             ]
         }
         
-        return await self.send_slack_message(payload)
+        return await self._broadcast(payload)
 
 
 # Singleton instance
@@ -286,15 +365,25 @@ webhook = WebhookService()
 
 
 # Helper function for sync context
-def send_notification(coro):
-    """Run async notification in sync context."""
+def send_notification(coro) -> None:
+    """
+    Run an async notification from sync code without blocking on it.
+    
+    Schedules onto the application loop when it is running (safe from
+    threadpool routes); otherwise runs the coroutine to completion.
+    """
+    loop = webhook._loop
+    if loop is not None and loop.is_running():
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        webhook._pending.add(future)
+        future.add_done_callback(webhook._pending.discard)
+    else:
+        asyncio.run(_run_and_close(coro))
+
+
+async def _run_and_close(coro) -> None:
+    """Run a notification on a temporary loop, closing the session created for it."""
     try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # Already in async context, schedule it
-            asyncio.create_task(coro)
-        else:
-            loop.run_until_complete(coro)
-    except RuntimeError:
-        # No event loop, create one
-        asyncio.run(coro)
+        await coro
+    finally:
+        await webhook.close()
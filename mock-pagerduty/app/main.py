@@ -2,55 +2,130 @@
 Mock PagerDuty API Service
 Simulates PagerDuty API v2 for testing the datasource integration.
 """
+import heapq
+import os
 import uuid
 import random
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from itertools import islice
+from operator import itemgetter
+from typing import Iterable, Optional
 
-from fastapi import FastAPI, Header, HTTPException
+import orjson
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 
-app = FastAPI(title="Mock PagerDuty API", version="1.0.0")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+app = FastAPI(
+    title="Mock PagerDuty API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
-# Mock data storage
+# Incident status values, interned so status comparisons and set lookups
+# (including against statuses parsed from query strings) hit the
+# identity fast path
+STATUS_TRIGGERED = sys.intern("triggered")
+STATUS_ACKNOWLEDGED = sys.intern("acknowledged")
+STATUS_RESOLVED = sys.intern("resolved")
+ALLOWED_STATUSES = frozenset((STATUS_TRIGGERED, STATUS_ACKNOWLEDGED, STATUS_RESOLVED))
+
+# Mock data storage; incidents are kept newest-first by created_at
 MOCK_INCIDENTS: list[dict] = []
 MOCK_SERVICES: list[dict] = [
     {"id": "PSVC001", "name": "API Gateway", "status": "active"},
     {"id": "PSVC002", "name": "Database Cluster", "status": "active"},
     {"id": "PSVC003", "name": "Auth Service", "status": "active"},
 ]
+# Newest-first incident buckets by status and by service id, kept in step
+# with MOCK_INCIDENTS so list filters only touch matching incidents
+INCIDENTS_BY_STATUS: dict[str, list[dict]] = {}
+INCIDENTS_BY_SERVICE: dict[str, list[dict]] = {}
+INCIDENTS_BY_ID: dict[str, dict] = {}
+
+# Serialized JSON of each incident by id, refreshed whenever it changes
+INCIDENT_JSON: dict[str, bytes] = {}
+
+# Bumped on every incident change; part of the list cache key so old
+# entries stop matching as soon as anything changes
+MUTATION_VERSION = 0
+
+# LRU of list_incidents bodies keyed by (version, query params)
+_LIST_CACHE: OrderedDict[tuple, bytes] = OrderedDict()
+_LIST_CACHE_SIZE = 64
+
+_BY_CREATED = itemgetter("created_at")
+
 MOCK_USERS: list[dict] = [
     {"id": "PUSER01", "name": "Mock Admin", "email": "admin@mock-pagerduty.local"},
 ]
 
 # Valid API keys for testing
-VALID_API_KEYS = ["mock-pd-api-key-12345", "test-api-key"]
+VALID_API_KEYS = frozenset(("mock-pd-api-key-12345", "test-api-key"))
+
+# PagerDuty's "Authorization: Token token=<key>" scheme
+TOKEN_PREFIX = b"Token token="
 
+# Full Authorization header values accepted by AuthASGI
+VALID_TOKENS = frozenset(TOKEN_PREFIX + key.encode() for key in VALID_API_KEYS)
 
-def verify_auth(authorization: Optional[str]) -> bool:
-    """Verify the Authorization header."""
-    if not authorization:
-        return False
-    if authorization.startswith("Token token="):
-        token = authorization.replace("Token token=", "")
-        return token in VALID_API_KEYS
-    return False
+# Paths served without an API key
+PUBLIC_PATHS = frozenset(("/", "/healthz", "/reset", "/docs", "/redoc", "/openapi.json"))
+
+_UNAUTHORIZED_BODY = b'{"detail":"Invalid API key"}'
+
+
+class AuthASGI:
+    """Reject requests without a valid API key before they reach routing."""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or scope["path"] in PUBLIC_PATHS:
+            await self.app(scope, receive, send)
+            return
+        
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                if value in VALID_TOKENS:
+                    await self.app(scope, receive, send)
+                    return
+                break
+        
+        await send({
+            "type": "http.response.start",
+            "status": 401,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(_UNAUTHORIZED_BODY)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": _UNAUTHORIZED_BODY})
+
+
+# CORS is added last so it wraps auth and 401s still carry CORS headers
+app.add_middleware(AuthASGI)
+# Only incident lists get large enough to be compressed
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
 
 
 def generate_mock_incidents():
     """Generate some mock incidents on startup."""
     global MOCK_INCIDENTS
     severities = ["critical", "high", "low"]
-    statuses = ["triggered", "acknowledged", "resolved"]
+    statuses = [STATUS_TRIGGERED, STATUS_ACKNOWLEDGED, STATUS_RESOLVED]
     titles = [
         "High CPU usage on production servers",
         "Database connection timeout",
@@ -62,51 +137,108 @@ def generate_mock_incidents():
         "Service health check failing",
     ]
     
+    now = datetime.now(timezone.utc)
+    now_iso = now.isoformat()
+    
+    # Draw all random fields up front, one call per field
+    count = len(titles)
+    active_statuses = random.choices(statuses[:2], k=count)
+    urgencies = random.choices(severities[:2], k=count)
+    services = random.choices(MOCK_SERVICES, k=count)
+    created_hours_ago = random.choices(range(1, 49), k=count)
+    resolved_hours_ago = random.choices(range(0, 2), k=count)
+    
     MOCK_INCIDENTS = []
     for i, title in enumerate(titles):
-        status = random.choice(statuses[:2]) if i < 5 else "resolved"  # First 5 are active
-        urgency = random.choice(severities[:2])
-        created_at = datetime.now(timezone.utc) - timedelta(hours=random.randint(1, 48))
+        status = active_statuses[i] if i < 5 else STATUS_RESOLVED  # First 5 are active
+        urgency = urgencies[i]
+        incident_id = f"PINC{i + 1:03d}"
+        created_at = now - timedelta(hours=created_hours_ago[i])
         
         incident = {
-            "id": f"PINC{str(i+1).zfill(3)}",
+            "id": incident_id,
             "incident_number": i + 1,
             "title": title,
             "description": f"Mock incident: {title}",
             "created_at": created_at.isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "updated_at": now_iso,
             "status": status,
             "urgency": urgency,
-            "html_url": f"https://mock-pagerduty.local/incidents/PINC{str(i+1).zfill(3)}",
-            "service": random.choice(MOCK_SERVICES),
+            "html_url": f"https://mock-pagerduty.local/incidents/{incident_id}",
+            "service": services[i],
             "escalation_policy": {"id": "PESC001", "type": "escalation_policy_reference"},
             "teams": [],
             "priority": None,
-            "resolved_at": (datetime.now(timezone.utc) - timedelta(hours=random.randint(0, 1))).isoformat() if status == "resolved" else None,
+            "resolved_at": (now - timedelta(hours=resolved_hours_ago[i])).isoformat() if status == STATUS_RESOLVED else None,
             "acknowledgements": [],
             "assignments": [],
-            "alert_counts": {"all": 1, "triggered": 0 if status == "resolved" else 1, "resolved": 1 if status == "resolved" else 0},
+            "alert_counts": {"all": 1, "triggered": 0 if status == STATUS_RESOLVED else 1, "resolved": 1 if status == STATUS_RESOLVED else 0},
             "type": "incident",
         }
         MOCK_INCIDENTS.append(incident)
+    
+    MOCK_INCIDENTS.sort(key=_BY_CREATED, reverse=True)
+    
+    INCIDENTS_BY_STATUS.clear()
+    INCIDENTS_BY_SERVICE.clear()
+    INCIDENTS_BY_ID.clear()
+    INCIDENT_JSON.clear()
+    for incident in MOCK_INCIDENTS:
+        INCIDENTS_BY_ID[incident["id"]] = incident
+        reserialize(incident)
+        INCIDENTS_BY_STATUS.setdefault(incident["status"], []).append(incident)
+        INCIDENTS_BY_SERVICE.setdefault(incident["service"]["id"], []).append(incident)
+
+
+def reserialize(incident: dict) -> None:
+    """Refresh the cached JSON for an incident after it changes."""
+    global MUTATION_VERSION
+    INCIDENT_JSON[incident["id"]] = orjson.dumps(incident)
+    MUTATION_VERSION += 1
+    _LIST_CACHE.clear()
+
+
+def set_incident_status(incident: dict, status: str) -> None:
+    """Change an incident's status, moving it to the matching status bucket."""
+    INCIDENTS_BY_STATUS[incident["status"]].remove(incident)
+    incident["status"] = status
+    bucket = INCIDENTS_BY_STATUS.setdefault(status, [])
+    bucket.append(incident)
+    bucket.sort(key=_BY_CREATED, reverse=True)
+
+
+def bucket_size(index: dict[str, list[dict]], keys: frozenset[str]) -> int:
+    """Number of incidents in the index buckets for the given keys."""
+    return sum(len(index[key]) for key in keys if key in index)
+
+
+def merge_buckets(index: dict[str, list[dict]], keys: frozenset[str]) -> Iterable[dict]:
+    """Lazy newest-first union of the index buckets for the given keys."""
+    buckets = [index[key] for key in keys if key in index]
+    if len(buckets) == 1:
+        return buckets[0]
+    return heapq.merge(*buckets, key=_BY_CREATED, reverse=True)
 
 
 # Generate mock data on startup
 generate_mock_incidents()
 
 
-# Pydantic models
-class User(BaseModel):
+# Response shapes (documentation only; responses are not validated against them)
+@dataclass(slots=True)
+class User:
     id: str
     name: str
     email: str
 
 
-class UserResponse(BaseModel):
+@dataclass(slots=True)
+class UserResponse:
     user: User
 
 
-class IncidentListResponse(BaseModel):
+@dataclass(slots=True)
+class IncidentListResponse:
     incidents: list[dict]
     limit: int
     offset: int
@@ -114,156 +246,186 @@ class IncidentListResponse(BaseModel):
     more: bool
 
 
-class ServiceListResponse(BaseModel):
+@dataclass(slots=True)
+class ServiceListResponse:
     services: list[dict]
 
 
+# Fixed response bodies, serialized once. A fresh Response wraps them per
+# request since middleware (CORS) appends to a response's header list.
+_ROOT_BODY = b'{"message":"Mock PagerDuty API","version":"v2"}'
+_HEALTH_BODY = b'{"status":"ok"}'
+
+
 # Endpoints
-@app.get("/")
+@app.get("/", include_in_schema=False, response_class=Response)
 async def root():
-    return {"message": "Mock PagerDuty API", "version": "v2"}
+    return Response(_ROOT_BODY, media_type="application/json")
 
 
-@app.get("/users/me", response_model=UserResponse)
-async def get_current_user(authorization: Optional[str] = Header(None)):
+@app.get("/users/me", response_model=None)
+async def get_current_user():
     """Get current user - used for connection testing."""
-    if not verify_auth(authorization):
-        raise HTTPException(status_code=401, detail="Invalid API key")
-    
     return {"user": MOCK_USERS[0]}
 
 
-@app.get("/incidents", response_model=IncidentListResponse)
+@app.get("/incidents", response_model=None)
 async def list_incidents(
-    authorization: Optional[str] = Header(None),
     statuses: Optional[str] = None,
     service_ids: Optional[str] = None,
     since: Optional[str] = None,
-    limit: int = 100,
-    offset: int = 0,
+    limit: int = Query(100, ge=0),
+    offset: int = Query(0, ge=0),
 ):
     """List incidents with optional filtering."""
-    if not verify_auth(authorization):
-        raise HTTPException(status_code=401, detail="Invalid API key")
+    cache_key = (MUTATION_VERSION, statuses, service_ids, limit, offset)
+    body = _LIST_CACHE.get(cache_key)
+    if body is not None:
+        _LIST_CACHE.move_to_end(cache_key)
+        return Response(body, media_type="application/json")
     
     # Parse statuses from query params (PD uses statuses[]=xxx format)
-    status_filter = []
+    status_filter = frozenset()
     if statuses:
-        status_filter = statuses.split(",")
-    
-    # Filter incidents
-    filtered = MOCK_INCIDENTS
-    
-    if status_filter:
-        filtered = [i for i in filtered if i["status"] in status_filter]
+        status_filter = frozenset(sys.intern(s) for s in statuses.split(",")) & ALLOWED_STATUSES
+        if not status_filter:
+            # Only unknown statuses were asked for; nothing can match
+            body = b'{"incidents":[],"limit":%d,"offset":%d,"total":0,"more":false}' % (limit, offset)
+            return Response(body, media_type="application/json")
+    svc_ids = frozenset(service_ids.split(",")) if service_ids else frozenset()
     
-    if service_ids:
-        svc_ids = service_ids.split(",")
-        filtered = [i for i in filtered if i["service"]["id"] in svc_ids]
+    # Filter and paginate lazily from the index buckets, so only the
+    # requested page is materialized
+    if status_filter and svc_ids:
+        # Start from whichever side matches fewer incidents; the total
+        # is only known after a full pass
+        if bucket_size(INCIDENTS_BY_STATUS, status_filter) <= bucket_size(INCIDENTS_BY_SERVICE, svc_ids):
+            matching = (
+                i for i in merge_buckets(INCIDENTS_BY_STATUS, status_filter)
+                if i["service"]["id"] in svc_ids
+            )
+        else:
+            matching = (
+                i for i in merge_buckets(INCIDENTS_BY_SERVICE, svc_ids)
+                if i["status"] in status_filter
+            )
+        paginated = []
+        total = 0
+        for incident in matching:
+            if offset <= total < offset + limit:
+                paginated.append(incident)
+            total += 1
+    elif status_filter or svc_ids:
+        index, keys = (INCIDENTS_BY_STATUS, status_filter) if status_filter else (INCIDENTS_BY_SERVICE, svc_ids)
+        # Buckets are disjoint, so their sizes add up to the total
+        total = bucket_size(index, keys)
+        paginated = list(islice(merge_buckets(index, keys), offset, offset + limit))
+    else:
+        total = len(MOCK_INCIDENTS)
+        paginated = MOCK_INCIDENTS[offset:offset + limit]
     
-    # Sort by created_at descending
-    filtered = sorted(filtered, key=lambda x: x["created_at"], reverse=True)
+    # Splice the cached per-incident JSON into the list envelope
+    body = b'{"incidents":[%b],"limit":%d,"offset":%d,"total":%d,"more":%b}' % (
+        b",".join([INCIDENT_JSON[i["id"]] for i in paginated]),
+        limit,
+        offset,
+        total,
+        b"true" if offset + limit < total else b"false",
+    )
     
-    # Paginate
-    total = len(filtered)
-    paginated = filtered[offset:offset + limit]
-    
-    return {
-        "incidents": paginated,
-        "limit": limit,
-        "offset": offset,
-        "total": total,
-        "more": offset + limit < total,
-    }
+    _LIST_CACHE[cache_key] = body
+    if len(_LIST_CACHE) > _LIST_CACHE_SIZE:
+        _LIST_CACHE.popitem(last=False)
+    return Response(body, media_type="application/json")
 
 
-@app.get("/services", response_model=ServiceListResponse)
-async def list_services(authorization: Optional[str] = Header(None)):
+@app.get("/services", response_model=None)
+async def list_services():
     """List all services."""
-    if not verify_auth(authorization):
-        raise HTTPException(status_code=401, detail="Invalid API key")
-    
     return {"services": MOCK_SERVICES}
 
 
 @app.post("/incidents/{incident_id}/resolve")
-async def resolve_incident(
-    incident_id: str,
-    authorization: Optional[str] = Header(None),
-):
+async def resolve_incident(incident_id: str):
     """Resolve an incident."""
-    if not verify_auth(authorization):
-        raise HTTPException(status_code=401, detail="Invalid API key")
-    
-    for inc in MOCK_INCIDENTS:
-        if inc["id"] == incident_id:
-            inc["status"] = "resolved"
-            inc["resolved_at"] = datetime.now(timezone.utc).isoformat()
-            inc["updated_at"] = datetime.now(timezone.utc).isoformat()
-            return {"incident": inc}
+    inc = INCIDENTS_BY_ID.get(incident_id)
+    if inc is None:
+        raise HTTPException(status_code=404, detail="Incident not found")
     
-    raise HTTPException(status_code=404, detail="Incident not found")
+    now_iso = datetime.now(timezone.utc).isoformat()
+    set_incident_status(inc, STATUS_RESOLVED)
+    inc["resolved_at"] = now_iso
+    inc["updated_at"] = now_iso
+    reserialize(inc)
+    return {"incident": inc}
 
 
 @app.post("/incidents/{incident_id}/acknowledge")
-async def acknowledge_incident(
-    incident_id: str,
-    authorization: Optional[str] = Header(None),
-):
+async def acknowledge_incident(incident_id: str):
     """Acknowledge an incident."""
-    if not verify_auth(authorization):
-        raise HTTPException(status_code=401, detail="Invalid API key")
+    inc = INCIDENTS_BY_ID.get(incident_id)
+    if inc is None:
+        raise HTTPException(status_code=404, detail="Incident not found")
     
-    for inc in MOCK_INCIDENTS:
-        if inc["id"] == incident_id:
-            if inc["status"] == "triggered":
-                inc["status"] = "acknowledged"
-                inc["updated_at"] = datetime.now(timezone.utc).isoformat()
-            return {"incident": inc}
-    
-    raise HTTPException(status_code=404, detail="Incident not found")
+    if inc["status"] == STATUS_TRIGGERED:
+        set_incident_status(inc, STATUS_ACKNOWLEDGED)
+        inc["updated_at"] = datetime.now(timezone.utc).isoformat()
+        reserialize(inc)
+    return {"incident": inc}
 
 
 @app.post("/incidents")
-async def create_incident(
-    authorization: Optional[str] = Header(None),
-):
+async def create_incident():
     """Create a new incident (for testing)."""
-    if not verify_auth(authorization):
-        raise HTTPException(status_code=401, detail="Invalid API key")
-    
-    new_id = f"PINC{str(len(MOCK_INCIDENTS) + 1).zfill(3)}"
+    now_iso = datetime.now(timezone.utc).isoformat()
+    new_id = f"PINC{len(MOCK_INCIDENTS) + 1:03d}"
     incident = {
         "id": new_id,
         "incident_number": len(MOCK_INCIDENTS) + 1,
-        "title": f"Test incident created at {datetime.now(timezone.utc).isoformat()}",
+        "title": f"Test incident created at {now_iso}",
         "description": "Manually created test incident",
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat(),
-        "status": "triggered",
+        "created_at": now_iso,
+        "updated_at": now_iso,
+        "status": STATUS_TRIGGERED,
         "urgency": "high",
         "html_url": f"https://mock-pagerduty.local/incidents/{new_id}",
         "service": MOCK_SERVICES[0],
         "resolved_at": None,
         "type": "incident",
     }
-    MOCK_INCIDENTS.append(incident)
+    # Newest incident, so it goes first to keep the list sorted
+    MOCK_INCIDENTS.insert(0, incident)
+    INCIDENTS_BY_ID[new_id] = incident
+    reserialize(incident)
+    INCIDENTS_BY_STATUS.setdefault(incident["status"], []).insert(0, incident)
+    INCIDENTS_BY_SERVICE.setdefault(incident["service"]["id"], []).insert(0, incident)
     
     return {"incident": incident}
 
 
-@app.post("/reset")
+@app.post("/reset", include_in_schema=False, response_class=Response)
 async def reset_mock_data():
     """Reset mock data to initial state."""
     generate_mock_incidents()
-    return {"message": "Mock data reset", "incident_count": len(MOCK_INCIDENTS)}
+    body = orjson.dumps({"message": "Mock data reset", "incident_count": len(MOCK_INCIDENTS)})
+    return Response(body, media_type="application/json")
 
 
-@app.get("/healthz")
+@app.get("/healthz", include_in_schema=False, response_class=Response)
 async def health():
-    return {"status": "ok"}
+    return Response(_HEALTH_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    uvicorn.run(
+        "app.main:app",
+        app_dir=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        host="0.0.0.0",
+        port=8080,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+        # Mock state is per process; keep 1 worker when tests mutate and read back
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )